@@ -56,10 +56,12 @@ module "lambda_upload" {
   kms_key_arn = module.security.kms_key_arn
   kms_key_id  = module.security.kms_key_id
 
-  aurora_cluster_arn   = module.aurora.cluster_arn
-  aurora_secret_arn    = module.aurora.secret_arn
   aurora_database_name = module.aurora.database_name
-  aurora_kms_key_arn   = module.aurora.kms_key_arn
+
+  db_proxy_endpoint          = module.aurora.proxy_endpoint
+  db_proxy_security_group_id = module.aurora.proxy_security_group_id
+  db_proxy_user_arn          = module.aurora.proxy_db_user_arn
+  db_username                = module.aurora.master_username
 
   tags = var.tags
 }
@@ -224,4 +224,117 @@ resource "aws_security_group_rule" "aurora_eks_ingress" {
   source_security_group_id = var.eks_node_security_group_id
   security_group_id        = aws_security_group.aurora.id
   description             = "Allow PostgreSQL access from EKS nodes"
-}
\ No newline at end of file
+}
+# RDS Proxy pools connections in front of the cluster so Lambdas can keep
+# persistent PostgreSQL sessions instead of going through the Data API
+resource "aws_security_group" "proxy" {
+  name        = "${var.project_name}-${var.env}-aurora-proxy-sg"
+  description = "Security group for Aurora RDS Proxy"
+  vpc_id      = var.vpc_id
+
+  egress {
+    description     = "PostgreSQL to Aurora cluster"
+    from_port       = 5432
+    to_port         = 5432
+    protocol        = "tcp"
+    security_groups = [aws_security_group.aurora.id]
+  }
+
+  tags = merge(var.tags, {
+    Environment = var.env
+    Terraform   = "true"
+  })
+}
+
+resource "aws_security_group_rule" "aurora_proxy_ingress" {
+  type                     = "ingress"
+  from_port                = 5432
+  to_port                  = 5432
+  protocol                 = "tcp"
+  source_security_group_id = aws_security_group.proxy.id
+  security_group_id        = aws_security_group.aurora.id
+  description              = "Allow PostgreSQL access from RDS Proxy"
+}
+
+resource "aws_iam_role" "proxy" {
+  name = "${var.project_name}-${var.env}-aurora-proxy"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Principal = {
+          Service = "rds.amazonaws.com"
+        }
+      }
+    ]
+  })
+
+  tags = merge(var.tags, {
+    Environment = var.env
+    Terraform   = "true"
+  })
+}
+
+resource "aws_iam_role_policy" "proxy_secret" {
+  name = "${var.project_name}-${var.env}-aurora-proxy-secret"
+  role = aws_iam_role.proxy.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["secretsmanager:GetSecretValue"]
+        Resource = aws_secretsmanager_secret.aurora.arn
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["kms:Decrypt"]
+        Resource = aws_kms_key.aurora.arn
+      }
+    ]
+  })
+}
+
+resource "aws_db_proxy" "aurora" {
+  name                   = "${var.project_name}-${var.env}-aurora-proxy"
+  engine_family          = "POSTGRESQL"
+  role_arn               = aws_iam_role.proxy.arn
+  vpc_subnet_ids         = var.subnet_ids
+  vpc_security_group_ids = [aws_security_group.proxy.id]
+  require_tls            = true
+  idle_client_timeout    = 1800
+
+  auth {
+    auth_scheme = "SECRETS"
+    iam_auth    = "REQUIRED"
+    secret_arn  = aws_secretsmanager_secret.aurora.arn
+  }
+
+  tags = merge(var.tags, {
+    Environment = var.env
+    Terraform   = "true"
+  })
+}
+
+resource "aws_db_proxy_default_target_group" "aurora" {
+  db_proxy_name = aws_db_proxy.aurora.name
+
+  connection_pool_config {
+    max_connections_percent      = 90
+    max_idle_connections_percent = 50
+    connection_borrow_timeout    = 120
+  }
+}
+
+resource "aws_db_proxy_target" "aurora" {
+  db_proxy_name         = aws_db_proxy.aurora.name
+  target_group_name     = aws_db_proxy_default_target_group.aurora.name
+  db_cluster_identifier = aws_rds_cluster.aurora.id
+}
+
+data "aws_region" "current" {}
+data "aws_caller_identity" "current" {}
@@ -37,3 +37,23 @@ output "database_name" {
   description = "Name of the default database"
   value       = aws_rds_cluster.aurora.database_name
 }
+
+output "master_username" {
+  description = "Master username for the database"
+  value       = var.master_username
+}
+
+output "proxy_endpoint" {
+  description = "Endpoint of the RDS Proxy in front of the cluster"
+  value       = aws_db_proxy.aurora.endpoint
+}
+
+output "proxy_security_group_id" {
+  description = "ID of the RDS Proxy security group"
+  value       = aws_security_group.proxy.id
+}
+
+output "proxy_db_user_arn" {
+  description = "rds-db:connect resource ARN for the master user through the RDS Proxy"
+  value       = "arn:aws:rds-db:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:dbuser:${element(split(":", aws_db_proxy.aurora.arn), 6)}/${var.master_username}"
+}
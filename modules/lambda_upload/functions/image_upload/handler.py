@@ -1,56 +1,171 @@
-import base64
+import binascii
+import io
 import json
 import uuid
 import time
 import os
-import boto3
-from typing import Dict, Any, Optional, List, Union
-from botocore.exceptions import ClientError
+import re
+import psycopg
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Union, BinaryIO, Sequence
+from botocore.exceptions import BotoCoreError, ClientError
 from botocore.config import Config
-from datetime import datetime
+from botocore.session import Session
+from s3transfer.manager import TransferConfig, TransferManager
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
 import logging
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Configure AWS RDS Data client
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    json_loads = orjson.loads
+except ImportError:
+    # Fall back to the stdlib with orjson's compact separators. orjson ships in
+    # the function's dependency layer, so this only happens in local runs or if
+    # the layer build was skipped.
+    logger.warning("orjson is not installed; falling back to the json module")
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+    json_loads = json.loads
+
+# Configure AWS client retries
 config = Config(
     retries = dict(
         max_attempts = 3
     )
 )
 
-class ImageUploadHandler:
-    def __init__(self):
-        self.s3_client = boto3.client('s3')
-        self.eventbridge_client = boto3.client('events')
-        self.rds_client = boto3.client('rds-data', config=config)
-        self.region = self.s3_client.meta.region_name
+# AWS clients are created once per container and reused across warm invocations.
+# botocore is used directly since none of boto3's extra layers are needed here.
+REGION = os.environ['AWS_REGION']
+session = Session()
+s3_client = session.create_client('s3', region_name=REGION)
+eventbridge_client = session.create_client('events', region_name=REGION)
+# Only used to sign IAM auth tokens locally; no API calls are made
+rds_client = session.create_client('rds', region_name=REGION, config=config)
+
+# Database access goes through RDS Proxy with IAM authentication
+DB_PROXY_HOST = os.environ['DB_PROXY_HOST']
+DB_PORT = int(os.environ.get('DB_PORT', '5432'))
+DB_USER = os.environ['DB_USER']
+DB_NAME = os.environ['DB_NAME']
+
+# IAM auth tokens are valid for 15 minutes; refresh a minute early
+AUTH_TOKEN_TTL_SECONDS = 14 * 60
+
+_auth_token: Optional[str] = None
+_auth_token_expires_at = 0.0
+_db_connection: Optional[psycopg.Connection] = None
+_db_connection_used_at = 0.0
+
+# A cached connection idle for longer than this is checked before reuse
+DB_CONNECTION_CHECK_IDLE_SECONDS = 60
+
+# Compact single-line statement so the text sent per insert stays small
+INSERT_PHOTO_SQL = (
+    "INSERT INTO photos ("
+    "user_id, company_id, photo_s3_link, project_table_name, client_side_id, file_path, title, description, "
+    "format, size, source_resolution_x, source_resolution_y, date_taken, date_uploaded, latitude, longitude"
+    ") VALUES ("
+    "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CAST(%s AS TIMESTAMP), NOW(), %s, %s"
+    ") RETURNING id"
+)
+
+# Shared worker pool, reused across warm invocations
+executor = ThreadPoolExecutor(max_workers=2)
 
-    def extract_and_validate_header_photo_details(self, event: Dict[str, Any]) -> Optional[Dict]:
+# Large images are split into parts and uploaded over parallel connections
+TRANSFER_CFG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_request_concurrency=10
+)
+transfer_manager = TransferManager(s3_client, config=TRANSFER_CFG)
+
+# Fields shared by every upload event; only DetailType and Detail vary
+EVENT_ENVELOPE = {
+    'Source': 'custom.imageUpload',
+    'EventBusName': 'default'
+}
+
+# PutEvents accepts at most 10 entries per call
+EVENTBRIDGE_MAX_BATCH = 10
+
+# Accepted date_taken formats, tried in order after the ISO fast path
+DATE_INPUT_FORMATS = ("%Y-%m-%d", "%m/%d/%y", "%m-%d-%y", "%m/%d/%y %H:%M:%S.%f")
+
+# Content types for image formats given as a file extension
+IMAGE_CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'heic': 'image/heic',
+}
+
+# Base64 characters read per decoding step
+BASE64_CHUNK_SIZE = 4 * 64 * 1024
+NON_BASE64_CHARS = re.compile(r'[^A-Za-z0-9+/=]')
+
+# Request header carrying each photo detail
+PHOTO_DETAIL_HEADERS = {
+    'bucket_name': 'x-bucket-name',
+    'file_name': 'x-file-name',
+    'models': 'x-models',
+    'company_id': 'x-company-id',
+    'user_id': 'x-user-id',
+    'project_table_name': 'x-project-table-name',
+    'client_side_id': 'x-client-side-id',
+    'title': 'x-title',
+    'description': 'x-description',
+    'format': 'x-format',
+    'size': 'x-size',
+    'source_resolution_x': 'x-source-resolution-x',
+    'source_resolution_y': 'x-source-resolution-y',
+    'date_taken': 'x-date-taken',
+    'latitude': 'x-latitude',
+    'longitude': 'x-longitude',
+}
+
+
+@dataclass
+class PhotoDetails:
+    """Photo details supplied in the upload request headers, as raw header strings."""
+    bucket_name: str
+    file_name: str
+    models: Optional[str]
+    company_id: Optional[str]
+    user_id: Optional[str]
+    project_table_name: Optional[str]
+    client_side_id: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    format: Optional[str]
+    size: Optional[str]
+    source_resolution_x: Optional[str]
+    source_resolution_y: Optional[str]
+    date_taken: Optional[str]
+    latitude: Optional[str]
+    longitude: Optional[str]
+
+
+class ImageUploadHandler:
+    def extract_and_validate_header_photo_details(self, event: Dict[str, Any]) -> Optional[PhotoDetails]:
         """Extract client_id from event headers or query parameters."""
         if 'headers' in event:
             headers = event.get('headers', {})
             if 'x-bucket-name' in event['headers'] and 'x-file-name' in event['headers']:
-                return {
-                    'bucket_name': headers.get('x-bucket-name'),
-                    'file_name': headers.get('x-file-name'),
-                    'models': headers.get('x-models'),
-                    'company_id': headers.get('x-company-id'),
-                    'user_id': headers.get('x-user-id'),
-                    'project_table_name': headers.get('x-project-table-name'),
-                    'client_side_id': headers.get('x-client-side-id'),
-                    'title': headers.get('x-title'),
-                    'description': headers.get('x-description'),
-                    'format': headers.get('x-format'),
-                    'size': headers.get('x-size'),
-                    'source_resolution_x': headers.get('x-source-resolution-x'),
-                    'source_resolution_y': headers.get('x-source-resolution-y'),
-                    'date_taken': headers.get('x-date-taken'),
-                    'latitude': headers.get('x-latitude'),
-                    'longitude': headers.get('x-longitude'),
-                }
+                return PhotoDetails(**{field: headers.get(header) for field, header in PHOTO_DETAIL_HEADERS.items()})
             else:
                 return None
         # elif 'queryStringParameters' in event and event['queryStringParameters']:
@@ -71,33 +186,35 @@ class ImageUploadHandler:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps(body)
+            'body': json_dumps(body)
         }
         
-    def upload_to_s3(self, file_content: bytes, file_path: str, bucket_name: str, content_type: str) -> bool:
+    def upload_to_s3(self, file_obj: BinaryIO, file_path: str, bucket_name: str, content_type: str) -> bool:
         """Upload file to S3 with metadata."""
         try:
-            content_type = ''
-            if content_type.lower() in ['jpg', 'jpeg']:
-                content_type = 'image/jpeg'
-            elif content_type.lower() == 'png':
-                content_type = 'image/png'
-            elif content_type.lower() == 'heic':
-                content_type = 'image/heic'
-            self.s3_client.put_object(
-                Bucket=bucket_name,
-                Key=file_path,
-                Body=file_content,
-                ContentType=content_type
-            )
+            # Accept either a MIME type or a bare image format such as 'jpg'
+            content_type = IMAGE_CONTENT_TYPES.get(content_type.lower(), content_type)
+            transfer_manager.upload(
+                file_obj,
+                bucket_name,
+                file_path,
+                extra_args={'ContentType': content_type}
+            ).result()
             return True
-        except ClientError as e:
-            logger.error(f"Error uploading to S3: {str(e)}")
+        except (ClientError, BotoCoreError) as e:
+            logger.error("Error uploading to S3: %s", e)
             return False
+
+    def delete_from_s3(self, bucket_name: str, file_path: str) -> None:
+        """Remove an uploaded object, logging its key if that fails."""
+        try:
+            s3_client.delete_object(Bucket=bucket_name, Key=file_path)
+        except (ClientError, BotoCoreError) as e:
+            logger.error("Error deleting orphaned upload s3://%s/%s: %s", bucket_name, file_path, e)
             
     def insert_photo_to_database(
             self,
-            request_id: uuid,
+            request_id: str,
             user_id: int,
             company_id: int,
             photo_s3_link: str,
@@ -115,80 +232,36 @@ class ImageUploadHandler:
             longitude: Union[float, None],
     ) -> int:
         # date_taken_converted = convert_to_postgres_date(date_taken) if date_taken is not None else None
-        response = self.rds_client.execute_statement(
-            resourceArn=os.environ['DB_CLUSTER_ARN'],
-            secretArn=os.environ['DB_SECRET_ARN'],
-            database=os.environ['DB_NAME'],
-            sql='''
-                INSERT INTO 
-                    photos (
-                        user_id, 
-                        company_id, 
-                        photo_s3_link, 
-                        project_table_name, 
-                        client_side_id, 
-                        file_path, 
-                        title, 
-                        description, 
-                        format, 
-                        size, 
-                        source_resolution_x, 
-                        source_resolution_y, 
-                        date_taken, 
-                        date_uploaded, 
-                        latitude, 
-                        longitude
-                    )
-                VALUES (
-                    :user_id, 
-                    :company_id, 
-                    :photo_s3_link, 
-                    :project_table_name, 
-                    :client_side_id, 
-                    :file_path, 
-                    :title, 
-                    :description, 
-                    :format, 
-                    :size, 
-                    :source_resolution_x, 
-                    :source_resolution_y, 
-                    CAST(:date_taken AS TIMESTAMP), 
-                    CAST(:date_uploaded AS TIMESTAMP), 
-                    :latitude, 
-                    :longitude
-                )
-                RETURNING
-                    id
-                ''',
-            parameters=[
-                {'name': 'user_id', 'value': {'longValue': user_id}},
-                {'name': 'company_id', 'value': {'longValue': company_id}},
-                {'name': 'photo_s3_link', 'value': {'stringValue': photo_s3_link}},
-                {'name': 'project_table_name', 'value': {'stringValue': project_table_name}},
-                {'name': 'client_side_id', 'value': {'stringValue': client_side_id} if client_side_id else {'isNull': True}},
-                {'name': 'file_path', 'value': {'stringValue': file_path} if file_path else {'isNull': True}},
-                {'name': 'title', 'value': {'stringValue': title} if title else {'isNull': True}},
-                {'name': 'description', 'value': {'stringValue': description} if description else {'isNull': True}},
-                {'name': 'format', 'value': {'stringValue': format} if format else {'isNull': True}},
-                {'name': 'size', 'value': {'longValue': size} if size else {'isNull': True}},
-                {'name': 'source_resolution_x', 'value': {'longValue': source_resolution_x} if source_resolution_x else {'isNull': True}},
-                {'name': 'source_resolution_y', 'value': {'longValue': source_resolution_y} if source_resolution_y else {'isNull': True}},
-                {'name': 'date_taken', 'value': {'stringValue': date_taken} if date_taken else {'isNull': True}},  # handling of None done above
-                {'name': 'date_uploaded', 'value': {'stringValue': datetime.now().isoformat()}},
-                {'name': 'latitude', 'value': {'doubleValue': latitude} if latitude else {'isNull': True}},
-                {'name': 'longitude', 'value': {'doubleValue': longitude} if longitude else {'isNull': True}},
-            ]
+        row = fetch_one(
+            INSERT_PHOTO_SQL,
+            (
+                user_id,
+                company_id,
+                photo_s3_link,
+                project_table_name,
+                client_side_id,
+                file_path,
+                title,
+                description,
+                format,
+                size,
+                source_resolution_x,
+                source_resolution_y,
+                date_taken,
+                latitude,
+                longitude,
+            )
         )
-        if response['records']:
+        if row:
             # Add your processing logic here
-            generated_photo_id = response['records'][0][0]['longValue']  # Assuming photo_id is an integer
-            logger.info(f"Successfully processed photo {generated_photo_id} for client {company_id}")
+            generated_photo_id = row[0]
+            logger.info("Successfully processed photo %s for client %s", generated_photo_id, company_id)
             return generated_photo_id
         else:
-            logger.error(f"Error generating record for photo from request {request_id} for client {company_id}")
+            logger.error("Error generating record for photo from request %s for client %s", request_id, company_id)
 
 
-    def send_events_to_eventbridge(self, request_id: uuid, bucket: str, photo_id: int, photo_s3_url: str, models: str, timestamp) -> bool:
+    def send_events_to_eventbridge(self, request_id: str, bucket: str, photo_id: int, photo_s3_url: str, models: str, timestamp) -> bool:
         """Send processing events to EventBridge."""
         try:
             # Prepare common event details
@@ -201,42 +274,38 @@ class ImageUploadHandler:
                 'photo_s3_link': photo_s3_url
             }
 
+            # Serialize the shared fields once and leave the object open so
+            # each event only appends its processingType
+            common_json = json_dumps(common_detail)[:-1]
+
             # Send main upload event
             main_event = {
-                'Source': 'custom.imageUpload',
+                **EVENT_ENVELOPE,
                 'DetailType': 'ImageUploaded',
-                'Detail': json.dumps({
-                    **common_detail,
-                    'processingType': 'upload'
-                }),
-                'EventBusName': 'default'
+                'Detail': f'{common_json},"processingType":"upload"}}'
             }
 
-            events = [main_event]
-
             models_parsed = models.split(",")
 
-            # Send events for each processing model
-            for model_name in models_parsed:
-                logger.info(f"creating event for model {model_name} for photo {photo_id}")
-                event = {
-                    'Source': 'custom.imageUpload',
+            # Build events for each processing model straight from the serialized prefix
+            logger.info("creating events for models %s for photo %s", models_parsed, photo_id)
+            events = [main_event] + [
+                {
+                    **EVENT_ENVELOPE,
                     'DetailType': f"{model_name}_processing",
-                    'Detail': json.dumps({
-                        **common_detail,
-                        'processingType': model_name
-                    }),
-                    'EventBusName': 'default'
+                    'Detail': f'{common_json},"processingType":{json_dumps(model_name)}}}'
                 }
-                events.append(event)
+                for model_name in models_parsed
+            ]
 
-            # Send all events in a single batch
-            logger.info(f"publishing events for photo {photo_id}")
-            self.eventbridge_client.put_events(Entries=events)
+            # Send events in as few batches as PutEvents allows
+            logger.info("publishing events for photo %s", photo_id)
+            for start in range(0, len(events), EVENTBRIDGE_MAX_BATCH):
+                eventbridge_client.put_events(Entries=events[start:start + EVENTBRIDGE_MAX_BATCH])
             return True
             
         except Exception as e:
-            logger.error(f"Error sending events to EventBridge: {str(e)}")
+            logger.error("Error sending events to EventBridge: %s", e)
             return False
 
     def handle_upload(self, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -246,106 +315,121 @@ class ImageUploadHandler:
             if 'body' not in event:
                 return self.create_response(400, {'error': 'No file content found'})
 
-            headers = self.extract_and_validate_header_photo_details(event)
-            if not headers:
-                self.create_response(400, {'error': 'Header does not contain required detail'})
+            details = self.extract_and_validate_header_photo_details(event)
+            if not details:
+                return self.create_response(400, {'error': 'Header does not contain required detail'})
 
-            logger.info(f"headers: {headers}")
+            logger.info("headers: %s", details)
 
             # TODO: auth check with token against DB
 
-            # photo_encoded = event['body']
-            body = json.loads(event['body'])
-            # Extract fields
-            base64_content = body.get('file_content')
+            # Function URLs deliver the body as a JSON string (base64 encoded for
+            # binary content types); direct invocations may pass a dict
+            raw_body = event['body']
+            if isinstance(raw_body, dict):
+                body = raw_body
+            else:
+                try:
+                    if event.get('isBase64Encoded'):
+                        raw_body = binascii.a2b_base64(raw_body)
+                    body = json_loads(raw_body)
+                except ValueError as e:
+                    logger.error("Exception parsing request body: %s", e)
+                    return self.create_response(400, {'error': 'Invalid request body'})
+            del raw_body
+            # Extract fields; the encoded image is popped so that only the
+            # decoded buffer survives past decoding
+            base64_content = body.pop('file_content', None)
             filename = body.get('filename', 'unknown')
-            mimetype = body.get('mimetype', 'application/octet-stream')
+            mimetype = body.get('mimetype') or details.format or 'application/octet-stream'
             try:
                 # file_content = base64.b64decode(photo_encoded)
-                file_content = base64.b64decode(base64_content)
+                file_buffer = decode_base64_to_buffer(base64_content)
             except Exception as e:
-                logger.error(f"Exception decoding file: {e}")
+                logger.error("Exception decoding file: %s", e)
                 return self.create_response(400, {'error': 'Invalid file content'})
+            finally:
+                del base64_content
 
-            bucket_name = headers.get('bucket_name')
-            file_name = headers.get('file_name')
-            # s3_response = self.s3_client.head_object(
+            bucket_name = details.bucket_name
+            file_name = details.file_name
+            # s3_response = s3_client.head_object(
             #     Bucket=bucket_name,
             #     Key=file_name
             # )
 
-            # Generate file path
-            file_path = f"uploads/{file_name}"
-            logger.info(f"file_path is: {file_path}")
-            s3_url = f"https://{bucket_name}.s3.{self.region}.amazonaws.com/{file_path}"
-            logger.info(f"s3_url: {s3_url}")
+            # Generate file metadata
+            timestamp = str(int(time.time()))
+            request_id = uuid.uuid4().hex
+
+            # Generate file path, unique per request so uploads never overwrite each other
+            file_path = f"uploads/{request_id}/{file_name}"
+            logger.info("file_path is: %s", file_path)
+            s3_url = s3_url_prefix(bucket_name) + file_path
+            logger.info("s3_url: %s", s3_url)
 
-            # Extract required fields from body
             # TODO: crystallize request format for request/EventBridge event/S3 photo publish that the frontend will use
-            models = headers.get("models")
-            bucket_name = headers.get("bucket_name")
-            user_id = headers.get("user_id")
-            company_id = headers.get("company_id")
-            photo_s3_link = s3_url
-            project_table_name = headers.get("project_table_name")
-            client_side_id = headers.get("client_side_id", None)
-            title = headers.get("title", None)
-            description = headers.get("description", None)
-            format = headers.get("format", None)
-            size = headers.get("size", None)
-            source_resolution_x = headers.get("source_resolution_x", None)
-            source_resolution_y = headers.get("source_resolution_y", None)
-            date_taken = headers.get("date_taken", None)
-            latitude = headers.get("latitude", None)
-            longitude = headers.get("longitude", None)
 
             # TODO: validate company_id and user_id against DB
 
-            # Generate file metadata
-            timestamp = str(int(time.time()))
-            request_id = str(uuid.uuid4())
-
-            # insert into database returning ID for push to future events
-            photo_id = self.insert_photo_to_database(
-                request_id,
-                int(user_id),
-                int(company_id),
-                photo_s3_link,
-                project_table_name,
-                client_side_id,
-                file_path,
-                title,
-                description,
-                format,
-                int(size) if size else None,
-                int(source_resolution_x) if source_resolution_x else None,
-                int(source_resolution_y) if source_resolution_y else None,
-                date_taken,
-                float(latitude) if latitude else None,
-                float(longitude) if longitude else None
-            )
-
-            # Upload to S3
+            # S3 key does not depend on the generated photo_id, so the upload
+            # and database insert run concurrently; the decoded image is released
+            # as soon as the upload finishes, before events are published
             # TODO: add retry logic
-            if not self.upload_to_s3(file_content, file_path, bucket_name, mimetype):
+            with file_buffer:
+                db_future = executor.submit(
+                    self.insert_photo_to_database,
+                    request_id,
+                    int(details.user_id),
+                    int(details.company_id),
+                    s3_url,
+                    details.project_table_name,
+                    details.client_side_id,
+                    file_path,
+                    details.title,
+                    details.description,
+                    details.format,
+                    int(details.size) if details.size else None,
+                    int(details.source_resolution_x) if details.source_resolution_x else None,
+                    int(details.source_resolution_y) if details.source_resolution_y else None,
+                    details.date_taken,
+                    float(details.latitude) if details.latitude else None,
+                    float(details.longitude) if details.longitude else None
+                )
+                s3_future = executor.submit(self.upload_to_s3, file_buffer, file_path, bucket_name, mimetype)
+                # Only the upload reads the buffer, so it is closed once that finishes
+                upload_error = s3_future.exception()
+            # Resolve the insert even if the upload failed, so it never keeps
+            # running on the shared executor after the handler returns
+            db_error = db_future.exception()
+            upload_succeeded = upload_error is None and s3_future.result()
+            if db_error is not None:
+                if upload_succeeded:
+                    # Don't leave an object behind that no photo row points to
+                    self.delete_from_s3(bucket_name, file_path)
+                raise db_error
+            if upload_error is not None:
+                raise upload_error
+            photo_id = db_future.result()
+            if not upload_succeeded:
                 return self.create_response(500, {'error': f'Failed to upload file for photo {photo_id}'})
 
             # Send events to EventBridge - retry handled by DLQ
             if not self.send_events_to_eventbridge(
-                request_id, bucket_name, photo_id, s3_url, models, timestamp
+                request_id, bucket_name, photo_id, s3_url, details.models, timestamp
             ):
-                logger.error(f"Warning: EventBridge event sending failed for photo {photo_id}")
+                logger.error("Warning: EventBridge event sending failed for photo %s", photo_id)
 
             # Return success response
             return self.create_response(200, {
                 'message': 'Upload successful',
                 'photo_id': photo_id,
                 'timestamp': timestamp,
-                'company_id': company_id
+                'company_id': details.company_id
             })
 
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+            logger.error("Unexpected error: %s", e)
             return self.create_response(500, {'error': 'Internal server error'})
 
 # Initialize handler
@@ -358,13 +442,119 @@ def handle_upload(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 # Helpers
 def convert_to_postgres_date(date_str):
-    input_formats = ["%Y-%m-%d", "%m/%d/%y", "%m-%d-%y", "%m/%d/%y %H:%M:%S.%f"]
-    for fmt in input_formats:
+    try:
+        # Fast path for the dominant ISO date (optionally with a time part)
+        return date.fromisoformat(date_str[:10]).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_INPUT_FORMATS:
         try:
-            parsed_date = datetime.strptime(date_str, fmt)
-            postgres_date = parsed_date.strftime('%Y-%m-%d')
-            return postgres_date
-        except ValueError as e:
-            logger.error(f"Error converting date: {e}")
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
 
+    logger.error("Error converting date: unrecognized format %r", date_str)
     raise ValueError("Unknown date format")
+
+
+def decode_base64_to_buffer(encoded: str) -> io.BytesIO:
+    """Decode base64 text into a buffer in bounded chunks, without copying the encoded payload.
+
+    Like base64.b64decode, characters outside the base64 alphabet (such as line
+    wrapping) are ignored; a partial quantum is carried into the next chunk.
+    """
+    buffer = io.BytesIO()
+    carry = ''
+    for start in range(0, len(encoded), BASE64_CHUNK_SIZE):
+        chunk = carry + encoded[start:start + BASE64_CHUNK_SIZE]
+        if '\n' in chunk:
+            chunk = chunk.replace('\r', '').replace('\n', '')
+        usable = len(chunk) - len(chunk) % 4
+        decoded = decode_aligned_base64(chunk, usable)
+        if decoded is None:
+            # Other non-alphabet characters threw off the alignment; strip them and retry
+            chunk = NON_BASE64_CHARS.sub('', chunk)
+            usable = len(chunk) - len(chunk) % 4
+            decoded = binascii.a2b_base64(chunk[:usable])
+        buffer.write(decoded)
+        carry = chunk[usable:]
+    if carry:
+        buffer.write(binascii.a2b_base64(carry))
+    buffer.seek(0)
+    return buffer
+
+
+@lru_cache(maxsize=64)
+def s3_url_prefix(bucket_name: str) -> str:
+    """Return the virtual-hosted S3 URL prefix for a bucket, cached for the container's lifetime."""
+    return f"https://{bucket_name}.s3.{REGION}.amazonaws.com/"
+
+
+def decode_aligned_base64(chunk: str, usable: int) -> Optional[bytes]:
+    """Decode the first usable characters of chunk, or return None if any were outside the alphabet."""
+    try:
+        decoded = binascii.a2b_base64(chunk[:usable])
+    except binascii.Error:
+        return None
+    padding = chunk[max(usable - 2, 0):usable].count('=')
+    if len(decoded) != usable // 4 * 3 - padding:
+        return None
+    return decoded
+
+
+def get_auth_token() -> str:
+    """Return a cached IAM auth token for the RDS Proxy, regenerating it before expiry."""
+    global _auth_token, _auth_token_expires_at
+    now = time.time()
+    if _auth_token is None or now >= _auth_token_expires_at:
+        _auth_token = rds_client.generate_db_auth_token(
+            DBHostname=DB_PROXY_HOST,
+            Port=DB_PORT,
+            DBUsername=DB_USER,
+            Region=REGION
+        )
+        _auth_token_expires_at = now + AUTH_TOKEN_TTL_SECONDS
+    return _auth_token
+
+
+def get_db_connection() -> psycopg.Connection:
+    """Return the container's database connection, opening it on first use or if it was found dead.
+
+    A connection that sat idle across invocations is pinged before being handed
+    out, so a stale socket is replaced before any statement is sent on it.
+    """
+    global _db_connection, _db_connection_used_at
+    now = time.time()
+    idle_seconds = now - _db_connection_used_at
+    if _db_connection is not None and not _db_connection.closed and idle_seconds > DB_CONNECTION_CHECK_IDLE_SECONDS:
+        try:
+            _db_connection.execute("SELECT 1")
+        except psycopg.OperationalError as e:
+            logger.error("Cached database connection is unusable, reconnecting: %s", e)
+            _db_connection.close()
+    if _db_connection is None or _db_connection.closed:
+        _db_connection = psycopg.connect(
+            host=DB_PROXY_HOST,
+            port=DB_PORT,
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=get_auth_token(),
+            sslmode='require',
+            connect_timeout=5,
+            autocommit=True,
+            # Server-side prepared statements pin the session to one backend in
+            # RDS Proxy, which defeats its connection multiplexing
+            prepare_threshold=None
+        )
+    _db_connection_used_at = now
+    return _db_connection
+
+
+def fetch_one(sql: str, params: Sequence[Any]) -> Optional[tuple]:
+    """Execute a statement and return its first row.
+
+    Errors are not retried: the statement may already have been committed.
+    """
+    with get_db_connection().cursor() as cur:
+        cur.execute(sql, params)
+        return cur.fetchone()
@@ -18,6 +18,21 @@ data "archive_file" "lambda_package" {
   output_path = "${path.module}/dist/image_upload.zip"
 }
 
+# Third-party packages from functions/image_upload/requirements.txt, installed
+# into build/layer/python by the "Build Lambda Dependencies" workflow step
+data "archive_file" "dependencies_layer" {
+  type        = "zip"
+  source_dir  = "${path.module}/build/layer"
+  output_path = "${path.module}/build/image_upload_dependencies.zip"
+}
+
+resource "aws_lambda_layer_version" "dependencies" {
+  layer_name          = "${var.project_name}-${var.env}-image-upload-dependencies"
+  filename            = data.archive_file.dependencies_layer.output_path
+  source_code_hash    = data.archive_file.dependencies_layer.output_base64sha256
+  compatible_runtimes = [var.lambda_runtime]
+}
+
 resource "aws_lambda_function" "image_upload" {
   filename      = data.archive_file.lambda_package.output_path
   function_name = "${var.project_name}-${var.env}-image-upload"
@@ -26,6 +41,7 @@ resource "aws_lambda_function" "image_upload" {
   runtime       = var.lambda_runtime
   memory_size   = var.memory_size
   timeout       = var.timeout
+  layers        = [aws_lambda_layer_version.dependencies.arn]
 
   vpc_config {
     subnet_ids         = var.subnet_ids
@@ -35,9 +51,9 @@ resource "aws_lambda_function" "image_upload" {
   environment {
     variables = {
       BUCKET_NAME        = var.s3_bucket_name
-      DB_SECRET_ARN     = var.aurora_secret_arn    # Add this
-      DB_CLUSTER_ARN    = var.aurora_cluster_arn   # Add this
       DB_NAME           = var.aurora_database_name  # Add this
+      DB_PROXY_HOST     = var.db_proxy_endpoint
+      DB_USER           = var.db_username
     }
   }
 
@@ -139,6 +155,14 @@ resource "aws_security_group" "lambda_sg" {
     cidr_blocks = ["0.0.0.0/0"]
   }
 
+  egress {
+    description     = "PostgreSQL to RDS Proxy"
+    from_port       = 5432
+    to_port         = 5432
+    protocol        = "tcp"
+    security_groups = [var.db_proxy_security_group_id]
+  }
+
   lifecycle {
     create_before_destroy = true
   }
@@ -149,6 +173,16 @@ resource "aws_security_group" "lambda_sg" {
   })
 }
 
+resource "aws_security_group_rule" "db_proxy_ingress" {
+  type                     = "ingress"
+  from_port                = 5432
+  to_port                  = 5432
+  protocol                 = "tcp"
+  source_security_group_id = aws_security_group.lambda_sg.id
+  security_group_id        = var.db_proxy_security_group_id
+  description              = "Allow PostgreSQL access from image upload Lambda"
+}
+
 resource "aws_iam_role" "lambda_role" {
   name = "${var.project_name}-${var.env}-lambda-role-new"
 
@@ -180,20 +214,9 @@ resource "aws_iam_role_policy" "lambda_rds_policy" {
       {
         Effect = "Allow"
         Action = [
-          "rds-data:ExecuteStatement",
-          "rds-data:BatchExecuteStatement",
-          "rds-data:BeginTransaction",
-          "rds-data:CommitTransaction",
-          "rds-data:RollbackTransaction"
-        ]
-        Resource = var.aurora_cluster_arn
-      },
-      {
-        Effect = "Allow"
-        Action = [
-          "secretsmanager:GetSecretValue"
+          "rds-db:connect"
         ]
-        Resource = var.aurora_secret_arn
+        Resource = var.db_proxy_user_arn
       }
     ]
   })
@@ -216,6 +239,7 @@ resource "aws_iam_role_policy" "lambda_s3_policy" {
         Action = [
           "s3:PutObject",
           "s3:PutObjectAcl",
+          "s3:AbortMultipartUpload",
           "s3:GetObject",
           "s3:GetObjectAcl",
           "s3:ListBucket",
@@ -280,12 +304,14 @@ resource "aws_iam_role_policy" "lambda_kms_policy" {
     Version = "2012-10-17"
     Statement = [
       {
+        # Upload bucket uses SSE-KMS; every object write needs a data key, and
+        # completing a multipart upload also decrypts it
         Effect = "Allow"
         Action = [
-          "kms:Decrypt",
-          "kms:DescribeKey"
+          "kms:GenerateDataKey",
+          "kms:Decrypt"
         ]
-        Resource = var.aurora_kms_key_arn  # You'll need to pass this from your Aurora module
+        Resource = var.kms_key_arn
       }
     ]
   })
@@ -64,22 +64,27 @@ variable "tags" {
   default     = {}
 }
 
-variable "aurora_cluster_arn" {
-  description = "ARN of the Aurora Serverless cluster"
+variable "aurora_database_name" {
+  description = "Name of the Aurora database"
   type        = string
 }
 
-variable "aurora_secret_arn" {
-  description = "ARN of the Aurora Serverless secret in Secrets Manager"
+variable "db_proxy_endpoint" {
+  description = "Endpoint of the RDS Proxy in front of the Aurora cluster"
   type        = string
 }
 
-variable "aurora_database_name" {
-  description = "Name of the Aurora database"
+variable "db_proxy_security_group_id" {
+  description = "ID of the RDS Proxy security group"
+  type        = string
+}
+
+variable "db_proxy_user_arn" {
+  description = "rds-db:connect resource ARN for the database user through the RDS Proxy"
   type        = string
 }
 
-variable "aurora_kms_key_arn" {
-  description = "ARN of the KMS key used for Aurora encryption"
+variable "db_username" {
+  description = "Database user the Lambda authenticates as with an IAM token"
   type        = string
 }